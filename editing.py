@@ -1,255 +1,364 @@
-# -*- coding: utf-8 -*-
-
-import networkx as nx
-from networkx import community as com
-from graphs import *
-from tralda import cograph as co, supertree as st
-from triples import *
-import random as rand
-import math
-
-__author__ = "Timothy Lindquist"
-
-def direct_graph_cut(G_ : nx.Graph, half_cut = False, R1 = True, R2 = True, init=True) -> nx.Graph:
-    '''
-    Applies weights and cuts directly on G with edge weights based on R(G)
-    until it is a cograph.
-
-    Parameters
-    ----------
-    G_ : nx.Graph
-    
-    init : bool, optional
-        Stops function from recomputing R(G). The default is True.
-
-    Returns
-    -------
-    nx.Graph
-        A cograph.
-
-    '''
-    if co.LinearCographDetector(G_).recognition():
-        return G_
-    
-    G = G_.copy()
-    comps = list(nx.connected_components(G))
-    
-    if init:
-        R = get_triples(G,R1,R2)
-        
-        for x,y in R:
-            if G.has_edge(x,y):
-                G.edges[x,y]["weight"] = len(R[x,y])
-            # Alternative weight function
-            # else:
-            #     if not R2:
-            #         for z in R[x,y]:
-            #             if "weight" not in G.edges[x,z]:
-            #                 G.edges[x,z]["weight"] = 1
-            #             else:
-            #                 G.edges[x,z]["weight"] += 1
-            #             if "weight" not in G.edges[y,z]:
-            #                 G.edges[y,z]["weight"] = 1
-            #             else:
-            #                 G.edges[y,z]["weight"] += 1
-                    
-        for x,y in G.edges:
-            if "weight" not in G.edges[x,y]:
-                G.edges[x,y]["weight"] = 0
-
-    if len(comps) > 1:
-        Gnew = nx.Graph()
-        for comp in comps:
-            G_comp = G.copy()
-            G_comp.remove_nodes_from([v for v in G.nodes if v not in comp])
-            G_new = union(Gnew, direct_graph_cut(G_comp,half_cut,R1,R2,False))
-        return Gnew
-    
-    
-    if half_cut:
-        V1,V2 = com.kernighan_lin_bisection(G)
-    else:
-        V1,V2 = nx.stoer_wagner(G)[1]
-        
-    current_edges = list(G.edges)
-    G2 = G.copy()
-    G.remove_nodes_from(V2)
-    G2.remove_nodes_from(V1)
-    G = direct_graph_cut(G,half_cut,R1,R2,False)
-    G2 = direct_graph_cut(G2,half_cut,R1,R2,False)
-
-    G_add = join(G,G2)
-    G_del = union(G,G2)
-    E_add = list(G_add.edges)
-    E_del = list(G_del.edges)
-    if n_sub_edits(current_edges, E_add) <\
-        n_sub_edits(current_edges, E_del):
-            return G_add
-    return G_del
-    
-def minimal_graph_cut(G : nx.Graph,\
-                      iterations : int = 5,\
-                      half_cut : bool = False,\
-                      R1 : bool = True, R2 : bool = True,\
-                      init : bool = True):
-    
-    G2 = direct_graph_cut(G,half_cut,R1,R2,init)
-    best_score = math.inf
-    cut_edges = [(x,y) for x,y in G.edges if not G2.has_edge(x, y)]
-    added_edges = [(x,y) for x,y in G2.edges if not (G.has_edge(x,y))]     
-    edited_edges = cut_edges + added_edges
-    for _ in range(iterations):
-        G_tmp = G2.copy()
-        rand.shuffle(edited_edges)
-        for x,y in edited_edges:
-            if G_tmp.has_edge(x, y):
-                G_tmp.remove_edge(x,y)
-                if not co.LinearCographDetector(G_tmp).recognition():
-                    G_tmp.add_edge(x,y)
-            else:
-                G_tmp.add_edge(x,y)
-                if not co.LinearCographDetector(G_tmp).recognition():
-                    G_tmp.remove_edge(x,y)
-        if n_edits(G, G_tmp) <= best_score:
-            G_min = G_tmp
-            
-    return G_min
-
-def min_edit(G):
-    return co.to_cograph(co.edit_to_cograph(G))
-
-def min_cut_split(R : dict, L : iter,\
-                  half_cut : bool = False, init : bool = True) -> dict:
-    '''
-    Finds a consistent subset of R by using BUILD and a balanced min-cut.
-
-    Parameters
-    ----------
-    R : dict
-        Triples.
-    L : list or iter
-        Leaves/vertices.
-    init : bool, optional
-        Used to make sure the original triple set is not overwritten.
-        The default is True.
-
-    Returns
-    -------
-    dict
-        Consistent subset of triples.
-    
-    References
-    ----------
-    Aho, Alfred V., et al. "Inferring a tree from lowest common ancestors with
-    an application to the optimization of relational expressions."
-    SIAM Journal on Computing 10.3 (1981): 405-421.
-    '''
-    
-    if len(L) < 3:
-        return R
-    if init:
-        # make copy
-        R = {(x,y):R[x,y] for x,y in R}
-    
-    CG = comp_graph(R, L)
-    comps = list(nx.connected_components(CG))
-    
-    if len(comps) > 1:
-        for comp in comps:
-            R = min_cut_split(R,comp,half_cut,init=False)
-    else:
-        # Cut if Aho graph is connected
-        if half_cut:
-            V1,V2 = com.kernighan_lin_bisection(CG)
-        else:
-            V1,V2 = nx.stoer_wagner(CG)[1]
-        cut = [(x,y) for x,y in CG.edges if ((x in V1 and y in V2) or (x in V2 and y in V1))]
-        for x,y in cut:
-            try:
-                R[x,y] = [z for z in R[x,y] if z not in CG.nodes]
-            except:
-                tmp = x
-                x = y
-                y = tmp
-                R[x,y] = [z for z in R[x,y] if z not in CG.nodes]
-            if len(R[x,y]) == 0:
-                R.pop((x,y))
-        if len(V1) > 2:
-            R = min_cut_split(R,V1,half_cut,init=False)
-        if len(V2) > 2:
-            R = min_cut_split(R,V2,half_cut,init=False)
-   
-    return R
-
-def min_cut_edit(G : nx.Graph, half_cut : bool = False,\
-                 R1 : bool = True, R2 : bool = True) -> nx.Graph:
-    R = get_triples(G,R1,R2)
-    R_new = min_cut_split(R,G.nodes,half_cut)
-    
-    #H = triples_to_cograph(R_new, G.nodes) # Old method
-    H = BUILD_cograph(R_new, G.nodes)
-    H_comp = nx.complement(H)
-    
-    if n_edits(G, H) < n_edits(G, H_comp):
-        return H
-    return H_comp
-
-def minimal_min_cut_edit(G : nx.Graph, iterations : int = 1,\
-                         half_cut : bool = False, R1 : bool = True,\
-                         R2 : bool = True) -> nx.Graph:
-    H = min_cut_edit(G,half_cut,R1,R2)
-    
-    cut_edges = [(x,y) for x,y in G.edges if not H.has_edge(x,y)]
-    best_score = len(G.edges)
-            
-    for _ in range(iterations):
-        G_tmp = H.copy()
-        rand.shuffle(cut_edges)
-        for x,y in cut_edges:
-            G_tmp.add_edge(x,y)
-            if not co.LinearCographDetector(G_tmp).recognition():
-                G_tmp.remove_edge(x,y)
-        if n_deletions(G, G_tmp) < best_score:
-            G_min = G_tmp
-    return G_min
-    
-def n_deletions(G,H):
-    n = 0
-    for x,y in G.edges:
-        if not H.has_edge(x,y):
-            n += 1
-    return n
-
-def n_edits(G,H):
-    n = 0
-    # Count edge deletions
-    for x,y in G.edges:
-        if not H.has_edge(x,y):
-            n += 1
-    # Count edge additions
-    for x,y in H.edges:
-        if not G.has_edge(x,y):
-            n += 1
-    return n
-
-def n_sub_edits(E, E_edited):
-    added_edges = set(E_edited).difference(E)
-    removed_edges = set(E).difference(E_edited)
-    return len(added_edges) + len(removed_edges)
-
-def random_editing(G):
-    G = G.copy()
-    n = len(G.nodes)
-    edges = list(G.edges)
-    if len(edges) < (n**2 - n)/2:
-        rand.shuffle(edges)
-        while not co.LinearCographDetector(G).recognition():
-            x,y = edges.pop()
-            G.remove_edge(x,y)
-        return G
-    edges = list(nx.complement(G).edges)
-    while not co.LinearCographDetector(G).recognition():
-        x,y = edges.pop()
-        G.add_edge(x,y)
-    return G
+# -*- coding: utf-8 -*-
+
+import networkx as nx
+from networkx import community as com
+from graphs import *
+from tralda import cograph as co, supertree as st
+from triples import *
+import random as rand
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+# Subproblems above this many vertices are worth shipping to another
+# process; below it the pickling overhead dominates.
+_PARALLEL_THRESHOLD = 256
+
+__author__ = "Timothy Lindquist"
+
+def direct_graph_cut(G_ : nx.Graph, half_cut = False, R1 = True, R2 = True,\
+                     init=True, executor=None, R=None) -> nx.Graph:
+    '''
+    Applies weights and cuts directly on G with edge weights based on R(G)
+    until it is a cograph.
+
+    Parameters
+    ----------
+    G_ : nx.Graph
+
+    init : bool, optional
+        Stops function from recomputing R(G). The default is True.
+    executor : ProcessPoolExecutor, optional
+        Used to run one side of each large cut in another process.
+        Created on demand for large inputs.
+    R : dict, optional
+        Precomputed get_triples(G_, R1, R2), so callers that run several
+        methods on the same graph enumerate triples only once.
+
+    Returns
+    -------
+    nx.Graph
+        A cograph.
+
+    '''
+    if init and executor is None and len(G_.nodes) > 2*_PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor() as ex:
+            return direct_graph_cut(G_, half_cut, R1, R2, init, ex, R)
+
+    if is_cograph(G_):
+        return G_
+
+    G = G_.copy()
+    comps = fast_connected_components(G)
+    
+    if init:
+        if R is None:
+            R = get_triples(G,R1,R2)
+        
+        Gadj = G._adj
+        Gedges = G.edges
+        for x,y in R:
+            if y in Gadj[x]:
+                Gedges[x,y]["weight"] = len(R[x,y])
+            # Alternative weight function
+            # else:
+            #     if not R2:
+            #         for z in R[x,y]:
+            #             if "weight" not in G.edges[x,z]:
+            #                 G.edges[x,z]["weight"] = 1
+            #             else:
+            #                 G.edges[x,z]["weight"] += 1
+            #             if "weight" not in G.edges[y,z]:
+            #                 G.edges[y,z]["weight"] = 1
+            #             else:
+            #                 G.edges[y,z]["weight"] += 1
+                    
+        for x,y in Gedges:
+            if "weight" not in Gedges[x,y]:
+                Gedges[x,y]["weight"] = 0
+
+    if len(comps) > 1:
+        Gnew = nx.Graph()
+        for comp in comps:
+            Gnew = union(Gnew, direct_graph_cut(subgraph(G, comp),
+                                                half_cut,R1,R2,False,
+                                                executor))
+        return Gnew
+    
+    
+    if half_cut:
+        V1,V2 = fast_kl(G)
+    else:
+        V1,V2 = stoer_wagner_cut(G)
+
+    current_edges = {frozenset(e) for e in G.edges}
+    G2 = G.copy()
+    G.remove_nodes_from(V2)
+    G2.remove_nodes_from(V1)
+    if executor is not None and min(len(V1), len(V2)) > _PARALLEL_THRESHOLD:
+        # the two sides are independent; solve one in another process
+        future = executor.submit(direct_graph_cut, G2, half_cut, R1, R2,
+                                 False)
+        G = direct_graph_cut(G,half_cut,R1,R2,False,executor)
+        G2 = future.result()
+    else:
+        G = direct_graph_cut(G,half_cut,R1,R2,False,executor)
+        G2 = direct_graph_cut(G2,half_cut,R1,R2,False,executor)
+
+    G_add = join(G,G2)
+    G_del = union(G,G2)
+    E_add = list(G_add.edges)
+    E_del = list(G_del.edges)
+    if n_sub_edits(current_edges, E_add) <\
+        n_sub_edits(current_edges, E_del):
+            return G_add
+    return G_del
+    
+def minimal_graph_cut(G : nx.Graph,\
+                      iterations : int = 5,\
+                      half_cut : bool = False,\
+                      R1 : bool = True, R2 : bool = True,\
+                      init : bool = True, R = None):
+
+    G2 = direct_graph_cut(G,half_cut,R1,R2,init,R=R)
+    best_score = math.inf
+    E_list = list(G.edges)
+    adjG = G._adj
+    adjG2 = G2._adj
+    cut_edges = [(x,y) for x,y in E_list if y not in adjG2[x]]
+    added_edges = [(x,y) for x,y in G2.edges if y not in adjG[x]]
+    edited_edges = cut_edges + added_edges
+    EG = {frozenset(e) for e in E_list}
+    for _ in range(iterations):
+        G_tmp = G2.copy()
+        rand.shuffle(edited_edges)
+        for x,y in edited_edges:
+            if G_tmp.has_edge(x, y):
+                G_tmp.remove_edge(x,y)
+                if not is_cograph(G_tmp):
+                    G_tmp.add_edge(x,y)
+            else:
+                G_tmp.add_edge(x,y)
+                if not is_cograph(G_tmp):
+                    G_tmp.remove_edge(x,y)
+        score = n_edits_fast(EG, G_tmp)
+        if score <= best_score:
+            G_min = G_tmp
+            best_score = score
+
+    return G_min
+
+def min_edit(G):
+    return co.to_cograph(co.edit_to_cograph(G))
+
+def min_cut_split(R : dict, L : iter,\
+                  half_cut : bool = False, init : bool = True,\
+                  executor=None) -> dict:
+    '''
+    Finds a consistent subset of R by using BUILD and a balanced min-cut.
+
+    Parameters
+    ----------
+    R : dict
+        Triples.
+    L : list or iter
+        Leaves/vertices.
+    init : bool, optional
+        Used to make sure the original triple set is not overwritten.
+        The default is True.
+    executor : ProcessPoolExecutor, optional
+        Used to solve large subproblems in other processes.
+        Created on demand for large inputs.
+
+    Returns
+    -------
+    dict
+        Consistent subset of triples.
+
+    References
+    ----------
+    Aho, Alfred V., et al. "Inferring a tree from lowest common ancestors with
+    an application to the optimization of relational expressions."
+    SIAM Journal on Computing 10.3 (1981): 405-421.
+    '''
+
+    if init:
+        if executor is None and len(L) > 2*_PARALLEL_THRESHOLD:
+            with ProcessPoolExecutor() as ex:
+                return min_cut_split(R, L, half_cut, init, ex)
+        # make copy
+        R = {(x,y):R[x,y] for x,y in R}
+
+    # Worklist of leaf sets instead of recursion; every task reads and
+    # prunes the one shared dict R. A subtree on leaves L only touches
+    # keys with both endpoints in L, so large subtrees can be shipped to
+    # another process on a snapshot of R and merged back by key.
+    futures = []
+    def _push(L_sub, CG_sub=None):
+        if executor is not None and len(L_sub) > _PARALLEL_THRESHOLD:
+            futures.append((set(L_sub), executor.submit(
+                min_cut_split, triple_copy(R), L_sub, half_cut, False)))
+        else:
+            stack.append((L_sub, CG_sub))
+
+    # Pruning only ever touches pairs crossing a cut, so the Aho graph of
+    # a child task is the induced subgraph of its parent's Aho graph and
+    # does not have to be rebuilt from R at every level.
+    stack = [(L, None)]
+    while stack:
+        L, CG = stack.pop()
+        if len(L) < 3:
+            continue
+
+        if CG is None:
+            CG = comp_graph(R, L)
+        comps = fast_connected_components(CG)
+
+        if len(comps) > 1:
+            for comp in comps:
+                _push(comp, subgraph(CG, comp))
+        else:
+            # Cut if Aho graph is connected
+            if half_cut:
+                V1,V2 = fast_kl(CG)
+            else:
+                V1,V2 = stoer_wagner_cut(CG)
+            V1set = set(V1)
+            V2set = set(V2)
+            CG_nodes = set(CG.nodes)
+            cut = [(x,y) for x,y in CG.edges if ((x in V1set and y in V2set) or (x in V2set and y in V1set))]
+            for x,y in cut:
+                key = (x,y) if (x,y) in R else (y,x)
+                R[key] = [z for z in R[key] if z not in CG_nodes]
+                if len(R[key]) == 0:
+                    R.pop(key)
+            if len(V1) > 2:
+                _push(V1, subgraph(CG, V1))
+            if len(V2) > 2:
+                _push(V2, subgraph(CG, V2))
+
+    for Vset, future in futures:
+        Rw = future.result()
+        for key in [k for k in R if k[0] in Vset and k[1] in Vset]:
+            del R[key]
+        for key in Rw:
+            if key[0] in Vset and key[1] in Vset:
+                R[key] = Rw[key]
+
+    return R
+
+def min_cut_edit(G : nx.Graph, half_cut : bool = False,\
+                 R1 : bool = True, R2 : bool = True, R = None) -> nx.Graph:
+    V = list(G.nodes)
+    if R is None:
+        R = get_triples(G,R1,R2)
+    R_new = min_cut_split(R,V,half_cut)
+
+    #H = triples_to_cograph(R_new, V) # Old method
+    H = BUILD_cograph(R_new, V)
+
+    # A pair is an edit against the complement of H exactly when it is
+    # not one against H, so the complement's edit count follows by
+    # inclusion-exclusion and the O(n^2) complement graph is only built
+    # when it wins.
+    n = len(V)
+    EG = {frozenset(e) for e in G.edges}
+    n_edit_H = n_edits_fast(EG, H)
+    if n_edit_H < n*(n-1)//2 - n_edit_H:
+        return H
+    return nx.complement(H)
+
+def minimal_min_cut_edit(G : nx.Graph, iterations : int = 1,\
+                         half_cut : bool = False, R1 : bool = True,\
+                         R2 : bool = True, R = None) -> nx.Graph:
+    H = min_cut_edit(G,half_cut,R1,R2,R)
+    
+    E_list = list(G.edges)
+    adjH = H._adj
+    cut_edges = [(x,y) for x,y in E_list if y not in adjH[x]]
+    EG = {frozenset(e) for e in E_list}
+    G_min = H
+    best_score = n_deletions_fast(EG, H)
+    for _ in range(iterations):
+        G_tmp = H.copy()
+        rand.shuffle(cut_edges)
+        for x,y in cut_edges:
+            G_tmp.add_edge(x,y)
+            if not is_cograph(G_tmp):
+                G_tmp.remove_edge(x,y)
+        score = n_deletions_fast(EG, G_tmp)
+        if score < best_score:
+            G_min = G_tmp
+            best_score = score
+    return G_min
+    
+def n_deletions(G,H):
+    adjH = H._adj
+    n = 0
+    for x,y in G.edges:
+        if x not in adjH or y not in adjH[x]:
+            n += 1
+    return n
+
+def n_edits(G,H):
+    adjG = G._adj
+    adjH = H._adj
+    n = 0
+    # Count edge deletions
+    for x,y in G.edges:
+        if x not in adjH or y not in adjH[x]:
+            n += 1
+    # Count edge additions
+    for x,y in H.edges:
+        if x not in adjG or y not in adjG[x]:
+            n += 1
+    return n
+
+def n_edits_fast(EG, H):
+    # EG is the edge set of G as frozensets, hoisted out of the caller's loop
+    EH = {frozenset(e) for e in H.edges}
+    return len(EG ^ EH)
+
+def n_deletions_fast(EG, H):
+    EH = {frozenset(e) for e in H.edges}
+    return len(EG - EH)
+
+def n_sub_edits(E, E_edited):
+    # frozensets make the comparison independent of endpoint order
+    A = E if isinstance(E, set) else {frozenset(e) for e in E}
+    B = {frozenset(e) for e in E_edited}
+    return len(A ^ B)
+
+def random_editing(G):
+    G = G.copy()
+    n = len(G.nodes)
+    edges = list(G.edges)
+    if len(edges) < (n**2 - n)/2:
+        rand.shuffle(edges)
+        return _batched_editing(G, edges, remove=True)
+    edges = list(nx.complement(G).edges)
+    return _batched_editing(G, edges, remove=False)
+
+def _batched_editing(G, edges, remove):
+    # Flip k edges per recognition instead of one: halve k when a batch
+    # overshoots into a cograph, double it otherwise, so the number of
+    # recognitions drops from O(|E|) to O(log|E|) in the good case.
+    k = max(1, len(edges) // 2)
+    while not is_cograph(G):
+        k = min(k, len(edges))
+        batch = [edges.pop() for _ in range(k)]
+        if remove:
+            G.remove_edges_from(batch)
+        else:
+            G.add_edges_from(batch)
+        if k > 1 and is_cograph(G):
+            # overshoot; undo and close in with smaller batches
+            if remove:
+                G.add_edges_from(batch)
+            else:
+                G.remove_edges_from(batch)
+            edges.extend(reversed(batch))
+            k //= 2
+        else:
+            k *= 2
+    return G
     
\ No newline at end of file
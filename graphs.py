@@ -1,416 +1,689 @@
-# -*- coding: utf-8 -*-
-
-import networkx as nx
-from networkx import random_graphs as rg
-from networkx import community as com
-from tralda import cograph as co, supertree as st, datastructures as ds
-import random as rand
-from triples import triple_dict_to_list, triple_subset
-
-__author__ = "Timothy Lindquist"
-
-def comp_graph(R : dict, V : list or iter) -> nx.Graph:
-    '''
-    Constructs a weighted comparability graph with vertices V
-    out of triples R.
-
-    Parameters
-    ----------
-    R : dict
-        Triples.
-    V : iter
-        Vertices/leaves.
-
-    Returns
-    -------
-    A : nx.Graph
-        Edge weighted comparability/Aho graph.
-
-    '''
-    A = nx.Graph()
-    A.add_nodes_from(V)
-    edges = [(x,y) for x,y in R if len(R[x,y]) > 0 and x in V and y in V]
-    for x,y in edges:
-        # Keep weights of leaves not in V
-        A.add_edge(x, y, weight=len([x,y]))
-    return A
-    
-
-def subgraph(G : nx.Graph, V : list or iter) -> nx.Graph:
-    '''
-    Constructs the induced subgraph of G on V.
-
-    Parameters
-    ----------
-    G : nx.Graph
-        
-    V : iter
-        Vertices.
-
-    Returns
-    -------
-    Gnew : nx.Graph
-        Non-shallow induced subgraph of G on V.
-
-    '''
-    
-    tmp = G.subgraph(V)
-    Gnew = nx.Graph()
-    Gnew.add_nodes_from(tmp.nodes(data=True))
-    Gnew.add_edges_from(tmp.edges(data=True))
-    return Gnew
-
-def edit_random_edges(G : nx.graph, n : int, add : bool = True) -> None:
-    '''
-    Edits n random edges of G.
-
-    Parameters
-    ----------
-    G : nx.graph
-        
-    n : int
-        Number of edges to edit.
-    add : bool, optional
-        False if edges should be removed. The default is True.
-
-    Returns
-    -------
-    None.
-
-    '''
-    C = list(nx.connected_components(G))
-    if add and len(C) > 1:
-        for _ in range(n):
-            c1,c2 = rand.sample(C,2)
-            v1 = rand.choice(c1)
-            v2 = rand.choice(c2)
-            G.add_edge(v1,v2)
-    else:
-        v1,v2 = nx.approximation.randomized_partitioning(G)[1]
-        for v in v1:
-            for u in v2:
-                if G.has_edge(v,u):
-                    G.remove_edge(v,u)
-
-def random_nograph(n : int, p=0.5):
-    '''
-    Constructs a random non-cograph on n vertices.
-
-    Parameters
-    ----------
-    n : int
-        Number of vertices.
-    p : float, optional
-        Edge probability in [0,1]. The default is 0.5.
-
-    Returns
-    -------
-    nx.Graph
-        Non cograph.
-
-    '''
-    if p < 0.1 or p > 0.9:
-        raise ValueError("p must be in [0.1,0.9]")
-    G = rg.fast_gnp_random_graph(n,p)
-    if co.LinearCographDetector(G).recognition():
-        return random_nograph(n,p)
-    return G
-
-def random_cograph(n : int) -> nx.Graph:
-    '''
-    Constructs a cograph on n vertices.
-
-    Parameters
-    ----------
-    n : int
-        Number of vertices.
-
-    Returns
-    -------
-    nx.Graph
-        Cograph.
-
-    '''
-    T = co.random_cotree(n)
-    return co.to_cograph(T)
-
-def disturbed_random_cograph(n : int, d : int) -> nx.Graph:
-    """
-    
-
-    Parameters
-    ----------
-    n : int
-        Number of vertices.
-    d : int
-        Number of disturbances.
-
-    Returns
-    -------
-    nx.Graph
-        Non-cograph on n vertices whose minimum cograph editing solution 
-        is no larger than d.
-
-    """
-    cograph = True
-    while cograph:
-        T = co.random_cotree(n)
-        G = co.to_cograph(T)
-        edges = list(nx.complement(G).edges) +list(G.edges)
-        rand.shuffle(edges)
-        for _ in range(d):
-            if edges != []:
-                i = rand.randint(0, len(edges) - 1)
-                x,y = edges.pop(i)
-                if G.has_edge(x, y):
-                    G.remove_edge(x, y)
-                else:
-                    G.add_edge(x,y)
-        cograph = co.LinearCographDetector(G).recognition()
-    return G
-
-def path_graph(n : int, label_start=0) -> nx.Graph:
-    '''
-    Constructs a path graph on n vertices with optional user controlled 
-    vertex labels.
-
-    Parameters
-    ----------
-    n : int
-        Number of vertices.
-    label_start : int, optional
-        The label of the first vertex. The default is 0.
-
-    Returns
-    -------
-    G : nx.Graph
-        Path graph.
-
-    '''
-    
-    G = nx.Graph()
-    for i in range(label_start, label_start + n-1):
-        G.add_edge(i,i+1)
-    return G
-
-def union(G1 : nx.Graph, G2 : nx.Graph) -> nx.Graph:
-    """
-    Constructs the graph that is the union of G1 and G2.
-
-    Parameters
-    ----------
-    G1 : nx.Graph
-
-    G2 : nx.Graph
-
-    Returns
-    -------
-    G : nx.Graph
-        The union of G1 & G2.
-
-    """
-    
-    G = G1.copy()
-    G.add_nodes_from(G2.nodes)
-    G.add_edges_from(G2.edges)
-    return G
-
-def join(G1 : nx.Graph, G2 : nx.Graph) -> nx.Graph:
-    """
-    Constructs the graph that is the join of G1 and G2.
-
-    Parameters
-    ----------
-    G1 : nx.Graph
-
-    G2 : nx.Graph
-
-    Returns
-    -------
-    G : nx.Graph
-        The join of G1 & G2.
-
-    """
-    G = union(G1,G2)
-    G.add_edges_from([(x,y) for x in G1.nodes for y in G2.nodes])
-    return G
-
-def recursive_join(C) -> nx.Graph:
-    """
-    Used to construct
-
-    Parameters
-    ----------
-    C : List
-        Entries are components of a comparability graph.
-
-    Returns
-    -------
-    G : nx.Graph
-        A graph whose triples induce C.
-
-    """
-    G = nx.Graph()
-    for c in C:
-        if type(c) == list: 
-            G = join(G,recursive_union(c))
-        else:
-            tmp = nx.Graph()
-            tmp.add_node(c)
-            G = join(G, tmp)
-    return G
-
-def recursive_union(C) -> nx.Graph:
-    """
-    
-
-    Parameters
-    ----------
-    C : List
-        Entries are compononents of a comparability graph.
-
-    Returns
-    -------
-    G : nx.Graph
-        A graph whose triples induce C.
-
-    """
-    G = nx.Graph()
-    for c in C:
-        if type(c) == list:
-            G = union(G,recursive_join(c))
-        else:
-            tmp = nx.Graph()
-            tmp.add_node(c)
-            G = union(G, tmp)
-    return G
-    
-def splinter(R : dict, L : list or iter, init : bool = True) -> list:
-    """
-    Uses BUILD to construct a list representation of the tree.
-
-    Parameters
-    ----------
-    R : dict
-        Triples.
-    L : iter
-        Leaves/vertices.
-
-    Returns
-    -------
-    S : list
-        A list representing a cotree (if one can be found)
-        without inner node labels.
-        
-    References
-    ----------
-    Aho, Alfred V., et al. "Inferring a tree from lowest common ancestors with
-    an application to the optimization of relational expressions."
-    SIAM Journal on Computing 10.3 (1981): 405-421.
-
-    """
-    if init:
-        r = triple_dict_to_list(R)
-        if not st.Build(r, L).build_tree():
-            
-            raise RuntimeError("R is not consistent. There is no cograph.")
-            return
-    S = []
-    G = nx.Graph()
-    G.add_nodes_from(L)
-    G.add_edges_from([(x,y) for x,y in R.keys()])
-    C = list(nx.connected_components(G))
-    for c in C:
-        if len(c) == 1:
-            S.extend(c)
-        else:
-            Rnew = {}
-            for x,y in R.keys():
-                if x in c and y in c:
-                    for z in R[x,y]:
-                        if z in c:
-                            if (x,y) in Rnew.keys():
-                                Rnew[x,y].append(z)
-                            else:
-                                Rnew[x,y] = [z]
-            S.append(splinter(Rnew,c,False))
-    return S
-
-def triples_to_cograph(R : dict, L : list or iter, root=1):
-    """
-    Given a set of compatible triples, a graph in which all are present
-    is computed.
-
-    Parameters
-    ----------
-    R : List
-        Entries should be triples.
-    L : List
-        Entries should be nodes/vertices/leaves.
-    root : Any, optional
-        If the original graph is disconnected, set to anything but 1.
-        The default is 1.
-
-    Returns
-    -------
-    G : nx.Graph
-        Cograph.
-
-    """
-    
-    S = splinter(R,L)
-    G = nx.Graph()
-    if root == 1:
-        G = recursive_join(S)
-    else:
-        G = recursive_union(S)
-    return G
-
-def BUILD_cograph(R : dict, L : iter, label : int = 0) -> nx.Graph:
-    """
-    Uses BUILD to construct a cograph if one exists.
-
-    Parameters
-    ----------
-    R : dict
-        Triples.
-    L : iter
-        Leaves/vertices.
-    label : int
-        0 for disjoint union, 1 for join.
-
-    Returns
-    -------
-    G : nx.Graph
-        Cograph if it exists, otherwise none.
-        
-    References
-    ----------
-    Aho, Alfred V., et al. "Inferring a tree from lowest common ancestors with
-    an application to the optimization of relational expressions."
-    SIAM Journal on Computing 10.3 (1981): 405-421.
-
-    """
-    G = nx.Graph()
-    if len(L) == 1:
-        G.add_node(L[0])
-        return G
-    if len(L) == 2:
-        G.add_nodes_from(L)
-        if label == 1:
-            G.add_edge(L[0],L[1])
-        return G
-    
-    CG = comp_graph(R, L)
-    comps = list(nx.connected_components(CG))
-    if len(comps) == 1:
-        raise Exception("R is not compatible.")
-        return
-    for C in comps:
-        if label == 1:
-            G=join(G,BUILD_cograph(
-                triple_subset(R,C),list(C),0))
-        else:
-            G = union(G,BUILD_cograph(
-                triple_subset(R,C),list(C),1))
+# -*- coding: utf-8 -*-
+
+import networkx as nx
+from networkx import random_graphs as rg
+from networkx import community as com
+from tralda import cograph as co, supertree as st, datastructures as ds
+import random as rand
+import itertools as it
+import heapq
+import numpy as np
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+try:
+    from scipy.sparse.csgraph import connected_components as _cc_scipy
+    _HAS_SCIPY = True
+except ImportError:
+    _HAS_SCIPY = False
+from triples import triple_dict_to_list, triple_subset
+
+__author__ = "Timothy Lindquist"
+
+def comp_graph(R : dict, V : list or iter) -> nx.Graph:
+    '''
+    Constructs a weighted comparability graph with vertices V
+    out of triples R.
+
+    Parameters
+    ----------
+    R : dict
+        Triples.
+    V : iter
+        Vertices/leaves.
+
+    Returns
+    -------
+    A : nx.Graph
+        Edge weighted comparability/Aho graph.
+
+    '''
+    A = nx.Graph()
+    A.add_nodes_from(V)
+    Vset = V if isinstance(V, (set, frozenset)) else set(V)
+    edges = [(x,y) for x,y in R if len(R[x,y]) > 0 and x in Vset and y in Vset]
+    for x,y in edges:
+        # Keep weights of leaves not in V
+        A.add_edge(x, y, weight=len([x,y]))
+    return A
+    
+
+_COGRAPH_CACHE = {}
+_COGRAPH_CACHE_MAX = 2**16
+
+def is_cograph(G : nx.Graph) -> bool:
+    '''
+    Cograph recognition memoized on the edge set.
+
+    Parameters
+    ----------
+    G : nx.Graph
+
+    Returns
+    -------
+    bool
+        True if G is a cograph. Isolated vertices never affect
+        cographness, so the edge set alone is a sound cache key.
+    '''
+    key = frozenset(frozenset(e) for e in G.edges)
+    result = _COGRAPH_CACHE.get(key)
+    if result is None:
+        result = bool(co.LinearCographDetector(G).recognition())
+        if len(_COGRAPH_CACHE) >= _COGRAPH_CACHE_MAX:
+            _COGRAPH_CACHE.pop(next(iter(_COGRAPH_CACHE)))
+        _COGRAPH_CACHE[key] = result
+    return result
+
+def fast_connected_components(G : nx.Graph) -> list:
+    '''
+    Connected components of G as a list of node sets, like
+    list(nx.connected_components(G)) but using SciPy's compiled BFS
+    when SciPy is available.
+
+    Parameters
+    ----------
+    G : nx.Graph
+
+    Returns
+    -------
+    list
+        The components as sets of nodes.
+    '''
+    if not _HAS_SCIPY or len(G.nodes) == 0:
+        return list(nx.connected_components(G))
+    V = list(G.nodes)
+    A = nx.to_scipy_sparse_array(G, nodelist=V, weight=None, format="csr")
+    n_cc, labels = _cc_scipy(A, directed=False)
+    comps = [set() for _ in range(n_cc)]
+    for v, c in zip(V, labels):
+        comps[c].add(v)
+    return comps
+
+def _stoer_wagner_kernel(W):
+    # Stoer-Wagner on a dense weight matrix; W is contracted in place.
+    # Returns the mask of original vertices on one side of a minimum cut.
+    n = W.shape[0]
+    active = np.ones(n, np.bool_)
+    # rep[v] = contracted vertex currently holding v
+    rep = np.arange(n)
+    best_w = np.inf
+    best_mask = np.zeros(n, np.bool_)
+    n_active = n
+    while n_active > 1:
+        a = 0
+        for v in range(n):
+            if active[v]:
+                a = v
+                break
+        added = np.zeros(n, np.bool_)
+        added[a] = True
+        w_sum = np.zeros(n)
+        for u in range(n):
+            if active[u] and not added[u]:
+                w_sum[u] = W[a,u]
+        s = a
+        t = a
+        cut_w = np.inf
+        for _ in range(n_active - 1):
+            # next most tightly connected vertex
+            v = -1
+            best = -1.0
+            for u in range(n):
+                if active[u] and not added[u] and w_sum[u] > best:
+                    best = w_sum[u]
+                    v = u
+            s = t
+            t = v
+            cut_w = w_sum[v]
+            added[v] = True
+            for u in range(n):
+                if active[u] and not added[u]:
+                    w_sum[u] += W[v,u]
+        # the cut of the phase separates everything merged into t
+        if cut_w < best_w:
+            best_w = cut_w
+            for u in range(n):
+                best_mask[u] = rep[u] == t
+        # contract the last two vertices t and s of the phase
+        for u in range(n):
+            W[s,u] += W[t,u]
+            W[u,s] += W[u,t]
+        W[s,s] = 0.0
+        active[t] = False
+        for u in range(n):
+            if rep[u] == t:
+                rep[u] = s
+        n_active -= 1
+    return best_mask
+
+if _HAS_NUMBA:
+    _stoer_wagner_kernel = njit(cache=True)(_stoer_wagner_kernel)
+
+def stoer_wagner_cut(G : nx.Graph) -> tuple:
+    '''
+    Computes a minimum weight edge cut of a connected graph with the
+    Stoer-Wagner algorithm on a dense weight matrix.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        Connected graph; edges may carry a "weight" attribute
+        (missing weights count as 1, as in nx.stoer_wagner).
+
+    Returns
+    -------
+    (V1, V2) : tuple
+        The two sides of a minimum cut.
+
+    References
+    ----------
+    Stoer, Mechthild, and Frank Wagner. "A simple min-cut algorithm."
+    Journal of the ACM 44.4 (1997): 585-591.
+    '''
+    V = list(G.nodes)
+    W = nx.to_numpy_array(G, nodelist=V, weight="weight", dtype=np.float64)
+    mask = _stoer_wagner_kernel(W)
+    V1 = [v for v,m in zip(V, mask) if m]
+    V2 = [v for v,m in zip(V, mask) if not m]
+    return V1, V2
+
+def fast_kl(G : nx.Graph) -> tuple:
+    '''
+    Balanced bisection by a single best-node-first pass: start from a
+    random balanced partition, repeatedly move the highest-gain unlocked
+    node from the larger side (Fiduccia-Mattheyses style heap updates),
+    and keep the best balanced prefix of the move sequence. A drop-in
+    replacement for kernighan_lin_bisection at a fraction of the cost.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        Edges may carry a "weight" attribute; missing weights count as 1.
+
+    Returns
+    -------
+    (V1, V2) : tuple
+        The two sides of the partition as sets.
+    '''
+    nodes = list(G.nodes)
+    if len(nodes) < 2:
+        return set(nodes), set()
+    rand.shuffle(nodes)
+    half = len(nodes)//2
+    side = {v: 0 if i < half else 1 for i,v in enumerate(nodes)}
+    sizes = [half, len(nodes) - half]
+    adj = G._adj
+
+    # gain = cut reduction if the node switches sides
+    gain = {}
+    for v in nodes:
+        g = 0
+        for u,d in adj[v].items():
+            w = d.get("weight", 1)
+            g += -w if side[u] == side[v] else w
+        gain[v] = g
+
+    heaps = ([], [])
+    ctr = 0
+    for v in nodes:
+        heapq.heappush(heaps[side[v]], (-gain[v], ctr, v))
+        ctr += 1
+
+    def _top(h):
+        # discard locked and stale entries
+        while h:
+            g,c,v = h[0]
+            if v in locked or -g != gain[v]:
+                heapq.heappop(h)
+            else:
+                return h[0]
+        return None
+
+    locked = set()
+    moves = []
+    cum = 0
+    best_cum = 0
+    best_len = 0
+    for _ in range(len(nodes)):
+        t0 = _top(heaps[0])
+        t1 = _top(heaps[1])
+        if sizes[0] > sizes[1]:
+            top, s = t0, 0
+        elif sizes[1] > sizes[0]:
+            top, s = t1, 1
+        else:
+            if t0 is not None and (t1 is None or t0[0] <= t1[0]):
+                top, s = t0, 0
+            else:
+                top, s = t1, 1
+        if top is None:
+            break
+        v = heapq.heappop(heaps[s])[2]
+        locked.add(v)
+        side[v] = 1 - s
+        sizes[s] -= 1
+        sizes[1-s] += 1
+        cum += gain[v]
+        moves.append(v)
+        for u,d in adj[v].items():
+            if u in locked:
+                continue
+            w = d.get("weight", 1)
+            if side[u] == side[v]:
+                gain[u] -= 2*w
+            else:
+                gain[u] += 2*w
+            heapq.heappush(heaps[side[u]], (-gain[u], ctr, u))
+            ctr += 1
+        if cum > best_cum and abs(sizes[0] - sizes[1]) <= 1:
+            best_cum = cum
+            best_len = len(moves)
+
+    # roll back to the best balanced prefix
+    for v in moves[best_len:]:
+        side[v] = 1 - side[v]
+    V1 = {v for v in side if side[v] == 0}
+    V2 = {v for v in side if side[v] == 1}
+    return V1, V2
+
+def subgraph(G : nx.Graph, V : list or iter) -> nx.Graph:
+    '''
+    Constructs the induced subgraph of G on V.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        
+    V : iter
+        Vertices.
+
+    Returns
+    -------
+    Gnew : nx.Graph
+        Non-shallow induced subgraph of G on V.
+
+    '''
+    
+    tmp = G.subgraph(V)
+    Gnew = nx.Graph()
+    Gnew.add_nodes_from(tmp.nodes(data=True))
+    Gnew.add_edges_from(tmp.edges(data=True))
+    return Gnew
+
+def edit_random_edges(G : nx.graph, n : int, add : bool = True) -> None:
+    '''
+    Edits n random edges of G.
+
+    Parameters
+    ----------
+    G : nx.graph
+        
+    n : int
+        Number of edges to edit.
+    add : bool, optional
+        False if edges should be removed. The default is True.
+
+    Returns
+    -------
+    None.
+
+    '''
+    C = fast_connected_components(G)
+    if add and len(C) > 1:
+        for _ in range(n):
+            c1,c2 = rand.sample(C,2)
+            v1 = rand.choice(c1)
+            v2 = rand.choice(c2)
+            G.add_edge(v1,v2)
+    else:
+        v1,v2 = nx.approximation.randomized_partitioning(G)[1]
+        for v in v1:
+            for u in v2:
+                if G.has_edge(v,u):
+                    G.remove_edge(v,u)
+
+def random_nograph(n : int, p=0.5):
+    '''
+    Constructs a random non-cograph on n vertices.
+
+    Parameters
+    ----------
+    n : int
+        Number of vertices.
+    p : float, optional
+        Edge probability in [0,1]. The default is 0.5.
+
+    Returns
+    -------
+    nx.Graph
+        Non cograph.
+
+    '''
+    if p < 0.1 or p > 0.9:
+        raise ValueError("p must be in [0.1,0.9]")
+    G = rg.fast_gnp_random_graph(n,p)
+    if co.LinearCographDetector(G).recognition():
+        return random_nograph(n,p)
+    return G
+
+def random_cograph(n : int) -> nx.Graph:
+    '''
+    Constructs a cograph on n vertices.
+
+    Parameters
+    ----------
+    n : int
+        Number of vertices.
+
+    Returns
+    -------
+    nx.Graph
+        Cograph.
+
+    '''
+    T = co.random_cotree(n)
+    return co.to_cograph(T)
+
+def disturbed_random_cograph(n : int, d : int) -> nx.Graph:
+    """
+    
+
+    Parameters
+    ----------
+    n : int
+        Number of vertices.
+    d : int
+        Number of disturbances.
+
+    Returns
+    -------
+    nx.Graph
+        Non-cograph on n vertices whose minimum cograph editing solution 
+        is no larger than d.
+
+    """
+    cograph = True
+    while cograph:
+        T = co.random_cotree(n)
+        G = co.to_cograph(T)
+        edges = list(nx.complement(G).edges) +list(G.edges)
+        # popping d random list positions one by one is O(d*|edges|);
+        # a uniform d-subset of pairs to flip is drawn in one sample
+        for i in rand.sample(range(len(edges)), min(d, len(edges))):
+            x,y = edges[i]
+            if G.has_edge(x, y):
+                G.remove_edge(x, y)
+            else:
+                G.add_edge(x,y)
+        cograph = co.LinearCographDetector(G).recognition()
+    return G
+
+def path_graph(n : int, label_start=0) -> nx.Graph:
+    '''
+    Constructs a path graph on n vertices with optional user controlled 
+    vertex labels.
+
+    Parameters
+    ----------
+    n : int
+        Number of vertices.
+    label_start : int, optional
+        The label of the first vertex. The default is 0.
+
+    Returns
+    -------
+    G : nx.Graph
+        Path graph.
+
+    '''
+    
+    G = nx.Graph()
+    for i in range(label_start, label_start + n-1):
+        G.add_edge(i,i+1)
+    return G
+
+def union(G1 : nx.Graph, G2 : nx.Graph) -> nx.Graph:
+    """
+    Constructs the graph that is the union of G1 and G2.
+
+    Parameters
+    ----------
+    G1 : nx.Graph
+
+    G2 : nx.Graph
+
+    Returns
+    -------
+    G : nx.Graph
+        The union of G1 & G2.
+
+    """
+    
+    G = G1.copy()
+    G.add_nodes_from(G2.nodes)
+    G.add_edges_from(G2.edges)
+    return G
+
+def join(G1 : nx.Graph, G2 : nx.Graph) -> nx.Graph:
+    """
+    Constructs the graph that is the join of G1 and G2.
+
+    Parameters
+    ----------
+    G1 : nx.Graph
+
+    G2 : nx.Graph
+
+    Returns
+    -------
+    G : nx.Graph
+        The join of G1 & G2.
+
+    """
+    G = union(G1,G2)
+    G.add_edges_from([(x,y) for x in G1.nodes for y in G2.nodes])
+    return G
+
+def _flatten_cotree(C, label, pairs):
+    """
+    Collects the leaves below C and, for every join node (label 1),
+    appends the leaf-set pairs of its children to pairs.
+    """
+    children = []
+    for c in C:
+        if type(c) == list:
+            children.append(_flatten_cotree(c, 1 - label, pairs))
+        else:
+            children.append([c])
+    if label == 1:
+        for A,B in it.combinations(children, 2):
+            pairs.append((A,B))
+    return [v for ch in children for v in ch]
+
+def _build_cotree_graph(C, label) -> nx.Graph:
+    # One pass: flatten the list cotree into leaf sets and join pairs,
+    # then add all edges at once instead of re-joining partial graphs.
+    pairs = []
+    leaves = _flatten_cotree(C, label, pairs)
+    G = nx.Graph()
+    G.add_nodes_from(leaves)
+    for A,B in pairs:
+        G.add_edges_from(it.product(A, B))
+    return G
+
+def recursive_join(C) -> nx.Graph:
+    """
+    Used to construct
+
+    Parameters
+    ----------
+    C : List
+        Entries are components of a comparability graph.
+
+    Returns
+    -------
+    G : nx.Graph
+        A graph whose triples induce C.
+
+    """
+    return _build_cotree_graph(C, 1)
+
+def recursive_union(C) -> nx.Graph:
+    """
+
+
+    Parameters
+    ----------
+    C : List
+        Entries are compononents of a comparability graph.
+
+    Returns
+    -------
+    G : nx.Graph
+        A graph whose triples induce C.
+
+    """
+    return _build_cotree_graph(C, 0)
+    
+def splinter(R : dict, L : list or iter, init : bool = True) -> list:
+    """
+    Uses BUILD to construct a list representation of the tree.
+
+    Parameters
+    ----------
+    R : dict
+        Triples.
+    L : iter
+        Leaves/vertices.
+
+    Returns
+    -------
+    S : list
+        A list representing a cotree (if one can be found)
+        without inner node labels.
+        
+    References
+    ----------
+    Aho, Alfred V., et al. "Inferring a tree from lowest common ancestors with
+    an application to the optimization of relational expressions."
+    SIAM Journal on Computing 10.3 (1981): 405-421.
+
+    """
+    if init:
+        r = triple_dict_to_list(R)
+        if not st.Build(r, L).build_tree():
+            
+            raise RuntimeError("R is not consistent. There is no cograph.")
+            return
+    S = []
+    G = nx.Graph()
+    G.add_nodes_from(L)
+    G.add_edges_from([(x,y) for x,y in R.keys()])
+    C = fast_connected_components(G)
+    for c in C:
+        if len(c) == 1:
+            S.extend(c)
+        else:
+            Rnew = {}
+            for x,y in R.keys():
+                if x in c and y in c:
+                    for z in R[x,y]:
+                        if z in c:
+                            if (x,y) in Rnew.keys():
+                                Rnew[x,y].append(z)
+                            else:
+                                Rnew[x,y] = [z]
+            S.append(splinter(Rnew,c,False))
+    return S
+
+def triples_to_cograph(R : dict, L : list or iter, root=1):
+    """
+    Given a set of compatible triples, a graph in which all are present
+    is computed.
+
+    Parameters
+    ----------
+    R : List
+        Entries should be triples.
+    L : List
+        Entries should be nodes/vertices/leaves.
+    root : Any, optional
+        If the original graph is disconnected, set to anything but 1.
+        The default is 1.
+
+    Returns
+    -------
+    G : nx.Graph
+        Cograph.
+
+    """
+    
+    S = splinter(R,L)
+    G = nx.Graph()
+    if root == 1:
+        G = recursive_join(S)
+    else:
+        G = recursive_union(S)
+    return G
+
+def BUILD_cograph(R : dict, L : iter, label : int = 0) -> nx.Graph:
+    """
+    Uses BUILD to construct a cograph if one exists.
+
+    Parameters
+    ----------
+    R : dict
+        Triples.
+    L : iter
+        Leaves/vertices.
+    label : int
+        0 for disjoint union, 1 for join.
+
+    Returns
+    -------
+    G : nx.Graph
+        Cograph if it exists, otherwise none.
+        
+    References
+    ----------
+    Aho, Alfred V., et al. "Inferring a tree from lowest common ancestors with
+    an application to the optimization of relational expressions."
+    SIAM Journal on Computing 10.3 (1981): 405-421.
+
+    """
+    G = nx.Graph()
+    # Worklist instead of recursion; restricting R to the current leaves
+    # happens lazily when the Aho graph is built, so the one dict R is
+    # shared by all tasks instead of being copied per level.
+    stack = [(list(L), label)]
+    while stack:
+        L, label = stack.pop()
+        if len(L) == 1:
+            G.add_node(L[0])
+            continue
+        if len(L) == 2:
+            G.add_nodes_from(L)
+            if label == 1:
+                G.add_edge(L[0],L[1])
+            continue
+
+        Lset = set(L)
+        CG = nx.Graph()
+        CG.add_nodes_from(L)
+        CG.add_edges_from((x,y) for x,y in R
+                          if x in Lset and y in Lset
+                          and any(z in Lset for z in R[x,y]))
+        comps = fast_connected_components(CG)
+        if len(comps) == 1:
+            raise Exception("R is not compatible.")
+        if label == 1:
+            # a join adds all edges between the leaf sets of its children
+            for C1,C2 in it.combinations(comps, 2):
+                G.add_edges_from(it.product(C1, C2))
+        for C in comps:
+            stack.append((list(C), 1 - label))
     return G
\ No newline at end of file
@@ -1,6 +1,13 @@
 # -*- coding: utf-8 -*-
 
 import networkx as nx
+import numpy as np
+
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
 
 __author__ = 'Timothy Lindquist'
 
@@ -27,27 +34,28 @@ def is_triple(G : nx.Graph, t : set, R1=True , R2=True) -> bool:
     '''
     
     x,y,z = t
-    
+    adj = G._adj
+
     # Check for triple satisfaction
-    if not G.has_edge(y,z) and not G.has_edge(x,z):
-    
+    if z not in adj[y] and z not in adj[x]:
+
         if R1:
-            if G.has_edge(x,y):
+            if y in adj[x]:
                 return True
-        if R2 and not G.has_edge(x,y):
-            for n in G.neighbors(x):
-                if G.has_edge(y,n) and not G.has_edge(z,n):
+        if R2 and y not in adj[x]:
+            for n in adj[x]:
+                if n in adj[y] and n not in adj[z]:
                     return True
         return False
-    
-    if G.has_edge(x,z) and G.has_edge(y,z):
-        
+
+    if z in adj[x] and z in adj[y]:
+
         if R1:
-            if not G.has_edge(x,y):
+            if y not in adj[x]:
                 return True
-        if R2 and G.has_edge(x,y):
-            for n in G.neighbors(z):
-                if not G.has_edge(x,n) and not G.has_edge(y,n):
+        if R2 and y in adj[x]:
+            for n in adj[z]:
+                if n not in adj[x] and n not in adj[y]:
                     return True
         return False
     return False
@@ -73,37 +81,213 @@ def get_triples(G : nx.Graph, R1=True, R2=True) -> dict:
     '''
     
     V = list(G.nodes)
+    n = len(V)
     triples = {}
-    for i in range(len(V)-1):
-        for j in range(i+1, len(V)):
-            for v in V:
-                if v != V[i] and v != V[j]:
-                    if is_triple(G,(V[i],V[j],v),R1,R2):
-                        if (V[i],V[j]) in triples.keys():
-                            triples[V[i],V[j]].append(v)
-                        else:
-                            triples[V[i],V[j]] = [v]
-    
+    if n < 3:
+        return triples
+
+    A = nx.to_numpy_array(G, nodelist=V, dtype=np.uint8)
+    if _HAS_NUMBA:
+        xs, ys, zs = _get_triples_kernel(A, R1, R2)
+    else:
+        xs, ys, zs = _get_triples_numpy(A, R1, R2)
+    for i, j, z in zip(xs, ys, zs):
+        triples.setdefault((V[i], V[j]), []).append(V[z])
     return triples
 
+def _get_triples_numpy(A, R1, R2):
+    # Evaluate the R1/R2 predicates of is_triple on a dense adjacency
+    # matrix, one row x = V[i] at a time, over all pairs (j,z).
+    n = A.shape[0]
+    Ab = A.astype(bool)
+    Aint = A.astype(np.int32)
+    # common[u,v] = number of common neighbors of u and v
+    common = Aint @ Aint
+    deg = Aint.sum(axis=0)
+
+    xs_parts, ys_parts, zs_parts = [], [], []
+    for i in range(n-1):
+        exy = Ab[i][:, None]    # E(x,y) broadcast over (j,z)
+        exz = Ab[i][None, :]    # E(x,z)
+        eyz = Ab                # E(y,z)
+        mask = np.zeros((n, n), dtype=bool)
+        if R2:
+            # T[j,z] = number of common neighbors of x, y and z
+            T = (Aint * Aint[i]) @ Aint
+        if R1:
+            # edge xy with z adjacent to neither endpoint
+            mask |= exy & ~exz & ~eyz
+            # non-edge xy with z adjacent to both endpoints
+            mask |= ~exy & exz & eyz
+        if R2:
+            # non-edge xy with a common neighbor of x,y avoiding z
+            mask |= ~exy & ~exz & ~eyz & ((common[i][:, None] - T) > 0)
+            # edge xy with a neighbor of z avoiding both x and y
+            mask |= exy & exz & eyz & \
+                ((deg[None, :] - common[i][None, :] - common + T) > 0)
+        # only pairs with j > i; z == i and z == j never satisfy the masks
+        mask[:i+1, :] = False
+        js, zs = np.nonzero(mask)
+        xs_parts.append(np.full(js.shape, i, dtype=np.int64))
+        ys_parts.append(js)
+        zs_parts.append(zs)
+
+    return (np.concatenate(xs_parts), np.concatenate(ys_parts),
+            np.concatenate(zs_parts))
+
+if _HAS_NUMBA:
+
+    @njit(cache=True)
+    def _is_triple_dense(A, x, y, z, R1, R2):
+        # is_triple on a dense adjacency matrix
+        n = A.shape[0]
+        if A[y,z] == 0 and A[x,z] == 0:
+            if A[x,y]:
+                return R1
+            if R2:
+                for k in range(n):
+                    if A[x,k] and A[y,k] and not A[z,k]:
+                        return True
+            return False
+        if A[x,z] and A[y,z]:
+            if A[x,y] == 0:
+                return R1
+            if R2:
+                for k in range(n):
+                    if A[z,k] and not A[x,k] and not A[y,k]:
+                        return True
+            return False
+        return False
+
+    @njit(parallel=True, cache=True)
+    def _get_triples_kernel(A, R1, R2):
+        # Two passes so each prange row writes into its own slice:
+        # first count triples per first vertex, then fill at the offsets.
+        n = A.shape[0]
+        counts = np.zeros(n, dtype=np.int64)
+        for i in prange(n-1):
+            c = 0
+            for j in range(i+1, n):
+                for z in range(n):
+                    if z != i and z != j and \
+                        _is_triple_dense(A, i, j, z, R1, R2):
+                            c += 1
+            counts[i] = c
+        offsets = np.zeros(n+1, dtype=np.int64)
+        for i in range(n):
+            offsets[i+1] = offsets[i] + counts[i]
+        xs = np.empty(offsets[n], dtype=np.int32)
+        ys = np.empty(offsets[n], dtype=np.int32)
+        zs = np.empty(offsets[n], dtype=np.int32)
+        for i in prange(n-1):
+            pos = offsets[i]
+            for j in range(i+1, n):
+                for z in range(n):
+                    if z != i and z != j and \
+                        _is_triple_dense(A, i, j, z, R1, R2):
+                            xs[pos] = i
+                            ys[pos] = j
+                            zs[pos] = z
+                            pos += 1
+        return xs, ys, zs
+
+class TripleSet:
+    '''
+    Array-backed triple set: three parallel index arrays xs, ys, zs where
+    entry k encodes the triple nodes[xs[k]] nodes[ys[k]] | nodes[zs[k]].
+    Keeping the columns as flat arrays gives sequential access and lets
+    subset() run as vectorized mask operations instead of dict traversal.
+    '''
+
+    def __init__(self, xs, ys, zs, nodes):
+        self.xs = xs
+        self.ys = ys
+        self.zs = zs
+        self.nodes = list(nodes)
+
+    def __len__(self):
+        return len(self.xs)
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    @classmethod
+    def from_dict(cls, R, nodes):
+        xs, ys, zs = [], [], []
+        index = {v:i for i,v in enumerate(nodes)}
+        for x,y in R:
+            for z in R[x,y]:
+                xs.append(index[x])
+                ys.append(index[y])
+                zs.append(index[z])
+        return cls(np.asarray(xs, dtype=np.int32),
+                   np.asarray(ys, dtype=np.int32),
+                   np.asarray(zs, dtype=np.int32), nodes)
+
+    def subset(self, L):
+        '''
+        Restricts to triples whose three members all lie in L. Unlike the
+        dict form, pairs whose z-list becomes empty are dropped entirely;
+        consumers already treat empty lists as absent.
+        '''
+        index = {v:i for i,v in enumerate(self.nodes)}
+        keep = np.zeros(len(self.nodes), dtype=bool)
+        for v in L:
+            if v in index:
+                keep[index[v]] = True
+        mask = keep[self.xs] & keep[self.ys] & keep[self.zs]
+        return TripleSet(self.xs[mask], self.ys[mask], self.zs[mask],
+                         self.nodes)
+
+    def to_list(self):
+        nodes = self.nodes
+        return [(nodes[i], nodes[j], nodes[k])
+                for i,j,k in zip(self.xs, self.ys, self.zs)]
+
+    def to_dict(self):
+        nodes = self.nodes
+        triples = {}
+        for i,j,k in zip(self.xs, self.ys, self.zs):
+            triples.setdefault((nodes[i], nodes[j]), []).append(nodes[k])
+        return triples
+
+def get_triple_set(G : nx.Graph, R1=True, R2=True) -> TripleSet:
+    '''
+    Array-backed variant of get_triples; the kernel output goes straight
+    into a TripleSet without building the intermediate dict.
+    '''
+    V = list(G.nodes)
+    if len(V) < 3:
+        empty = np.empty(0, dtype=np.int32)
+        return TripleSet(empty, empty, empty, V)
+    A = nx.to_numpy_array(G, nodelist=V, dtype=np.uint8)
+    if _HAS_NUMBA:
+        xs, ys, zs = _get_triples_kernel(A, R1, R2)
+    else:
+        xs, ys, zs = _get_triples_numpy(A, R1, R2)
+    return TripleSet(xs, ys, zs, V)
+
 def triple_subset(R : dict, L : iter) -> dict:
     '''
-    
+
 
     Parameters
     ----------
-    R : dict
+    R : dict or TripleSet
         triples.
     L : iter
         leaves/vertices to restrict R.
 
     Returns
     -------
-    dict
+    dict or TripleSet
         R restricted by L.
 
     '''
-    return {(x,y):[z for z in R[x,y] if z in L] for x,y in R.keys() if x in L and y in L}
+    if isinstance(R, TripleSet):
+        return R.subset(L)
+    Lset = L if isinstance(L, (set, frozenset)) else set(L)
+    return {(x,y):[z for z in R[x,y] if z in Lset] for x,y in R.keys() if x in Lset and y in Lset}
 
 def triple_dict_to_list(R : dict) -> list:
     '''
@@ -111,7 +295,7 @@ def triple_dict_to_list(R : dict) -> list:
 
     Parameters
     ----------
-    R : dict
+    R : dict or TripleSet
         triples (x,y):[*] for xy|*.
 
     Returns
@@ -120,6 +304,8 @@ def triple_dict_to_list(R : dict) -> list:
         triples (x,y,*).
 
     '''
+    if isinstance(R, TripleSet):
+        return R.to_list()
     return [(x,y,z) for x,y in R.keys() for z in R[x,y]]
 
 def triple_list_to_dict(R : list) -> dict: